@@ -1,8 +1,16 @@
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Callable, Sequence
+from dataclasses import dataclass, field
+from functools import lru_cache, partial
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from itertools import chain
+import asyncio
 import os
+import sys
+import threading
 
 # Database helpers
 from database import db, create_document, get_documents
@@ -12,7 +20,11 @@ import boto3
 from botocore.config import Config
 from botocore.exceptions import ClientError
 
-app = FastAPI(title="AWS Cleanup Tool API", version="1.0.0")
+# Fast JSON encoding for large resource listings
+import orjson
+from cachetools import TTLCache
+
+app = FastAPI(title="AWS Cleanup Tool API", version="1.0.0", default_response_class=ORJSONResponse)
 
 # CORS setup
 app.add_middleware(
@@ -33,22 +45,122 @@ class ListRequest(BaseModel):
     regions: Optional[List[str]] = None
 
 
+@dataclass(frozen=True, slots=True)
+class ResourceRecord:
+    # Slotted rather than a model or dict: scans can yield many thousands of
+    # these, and orjson serializes dataclasses natively
+    id: str
+    resource_type: str
+    region: str
+    account_id: str
+    tags: Dict[str, str] = field(default_factory=dict)
+    state: Optional[str] = None
+
+
+class ListResponse(BaseModel):
+    count: int
+    resources: List[ResourceRecord]
+
+
 class DeleteRequest(BaseModel):
     resources: List[Dict[str, Any]]  # list of objects with resource_type, id, region, account_id
 
 
+# Supported resource types. Interned so dict/set lookups against request
+# values (interned in _plan_scan) hit the identity fast path.
+_EC2_INSTANCE = sys.intern("ec2:instance")
+_S3_BUCKET = sys.intern("s3:bucket")
+_RDS_DB = sys.intern("rds:db")
+_IAM_USER = sys.intern("iam:user")
+
+_DEFAULT_RESOURCE_TYPES = (_EC2_INSTANCE, _S3_BUCKET, _RDS_DB, _IAM_USER)
+
+# Common commercial regions; users can override in request
+_DEFAULT_REGIONS = (
+    "us-east-1", "us-east-2", "us-west-1", "us-west-2",
+    "eu-west-1", "eu-west-2", "eu-central-1",
+    "ap-south-1", "ap-southeast-1", "ap-southeast-2",
+)
+
+# Resource types that are not regional and are scanned once per request
+_GLOBAL_TYPES = frozenset({_S3_BUCKET, _IAM_USER})
+
+# Region used for clients of global services (STS, S3 listing, IAM)
+_GLOBAL_REGION = "us-east-1"
+
+# Region reported on records of global resource types
+_GLOBAL_REGION_LABEL = "global"
+
+# Resource types served by the Resource Groups Tagging API, mapped to its
+# ResourceTypeFilters values. The API is regional, so global types stay on
+# their own scanners: S3 buckets would only be found in the requested regions,
+# and IAM users are not reliably covered.
+_TAGGING_API_TYPES = {
+    _EC2_INSTANCE: "ec2:instance",
+    _RDS_DB: "rds:db",
+}
+
+_ACCESS_DENIED_CODES = {"AccessDenied", "AccessDeniedException", "UnauthorizedOperation"}
+
+# Per-resource tag lookups (S3 buckets, IAM users) are fanned out this wide
+_TAG_FETCH_WORKERS = 32
+
+# Short-lived cache for global listings (buckets, users) and bucket tags, which
+# successive /list calls would otherwise refetch. Keys start with the account id.
+_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=60)
+_CACHE_LOCK = threading.Lock()
+
+# Upper bound on InstanceIds per DescribeInstances call, and on values in a
+# single EC2 filter (FilterLimitExceeded above it)
+_DESCRIBE_BATCH_SIZE = 1000
+_FILTER_VALUES_LIMIT = 200
+
+# Upper bound on InstanceIds per TerminateInstances call
+_TERMINATE_BATCH_SIZE = 1000
+
+# DeleteObjects takes at most 1000 keys; chunks of a bucket are emptied in parallel
+_S3_DELETE_BATCH_SIZE = 1000
+_S3_DELETE_WORKERS = 8
+
+# Shared by every client. Adaptive retries back off on throttling so the
+# concurrent scans can push harder, and the pool must exceed the tag-fetch
+# fan-out or requests queue waiting for a connection.
+_CLIENT_CONFIG = Config(
+    retries={"max_attempts": 10, "mode": "adaptive"},
+    max_pool_connections=64,
+    tcp_keepalive=True,
+    connect_timeout=3,
+    read_timeout=30,
+    # None of the services used here need endpoint discovery; skip the probe
+    endpoint_discovery_enabled=False,
+)
+
+# One session for the process; creating a session re-reads credentials and
+# region metadata. Sessions are not thread-safe, so clients are created under
+# _CLIENT_LOCK.
+_SESSION = boto3.Session()
+
+# boto3 clients are thread-safe; reuse one per (service, region)
+_CLIENT_CACHE: Dict[tuple, Any] = {}
+_CLIENT_LOCK = threading.Lock()
+
+
 def _aws_clients(service: str, region: str):
-    session = boto3.Session()
-    return session.client(service, region_name=region, config=Config(retries={"max_attempts": 3}))
+    if not region or region == _GLOBAL_REGION_LABEL:
+        region = _GLOBAL_REGION
+    key = (service, region)
+    with _CLIENT_LOCK:
+        client = _CLIENT_CACHE.get(key)
+        if client is None:
+            client = _SESSION.client(service, region_name=region, config=_CLIENT_CONFIG)
+            _CLIENT_CACHE[key] = client
+    return client
 
 
-def _default_regions() -> List[str]:
-    # Common commercial regions; users can override in request
-    return [
-        "us-east-1", "us-east-2", "us-west-1", "us-west-2",
-        "eu-west-1", "eu-west-2", "eu-central-1",
-        "ap-south-1", "ap-southeast-1", "ap-southeast-2",
-    ]
+@lru_cache(maxsize=1)
+def _get_account_id() -> str:
+    # The caller identity does not change for the lifetime of the process
+    return _aws_clients("sts", _GLOBAL_REGION).get_caller_identity()["Account"]
 
 
 @app.get("/")
@@ -68,143 +180,496 @@ async def test():
         return {"database": f"error: {e}"}
 
 
-@app.post("/list")
-async def list_resources(payload: ListRequest):
-    scope = payload.filter_scope
-    regions = payload.regions or _default_regions()
-    resource_types = payload.resource_types or ["ec2:instance", "s3:bucket", "rds:db", "iam:user"]
+def _cached(key: tuple, fetch: Callable[[], Any]) -> Any:
+    with _CACHE_LOCK:
+        if key in _CACHE:
+            return _CACHE[key]
+    # Fetch outside the lock so slow AWS calls don't serialize each other
+    value = fetch()
+    with _CACHE_LOCK:
+        _CACHE[key] = value
+    return value
 
-    matched: List[Dict[str, Any]] = []
 
+def _invalidate(*keys: tuple) -> None:
+    with _CACHE_LOCK:
+        for key in keys:
+            _CACHE.pop(key, None)
+
+
+def _get_bucket_tags(s3, name: str) -> List[Dict[str, str]]:
     try:
-        for region in regions:
-            for rtype in resource_types:
-                if rtype == "ec2:instance":
-                    ec2 = _aws_clients("ec2", region)
-                    resp = ec2.describe_instances()
-                    for resv in resp.get("Reservations", []):
-                        for inst in resv.get("Instances", []):
-                            tags = {t["Key"]: t.get("Value", "") for t in inst.get("Tags", [])}
-                            account_id = boto3.client("sts").get_caller_identity()["Account"]
-                            if scope == "tag":
-                                if (payload.tag_key and payload.tag_key in tags and
-                                   (payload.tag_value is None or tags.get(payload.tag_key) == payload.tag_value)):
-                                    matched.append({
-                                        "id": inst.get("InstanceId"),
-                                        "resource_type": rtype,
-                                        "region": region,
-                                        "account_id": account_id,
-                                        "tags": tags,
-                                        "state": inst.get("State", {}).get("Name"),
-                                    })
-                            else:
-                                matched.append({
-                                    "id": inst.get("InstanceId"),
-                                    "resource_type": rtype,
-                                    "region": region,
-                                    "account_id": account_id,
-                                    "tags": tags,
-                                    "state": inst.get("State", {}).get("Name"),
-                                })
-                elif rtype == "s3:bucket":
-                    s3 = _aws_clients("s3", region)
-                    # S3 is global, but we try to fetch list then get tags per bucket
-                    s3g = boto3.client("s3")
-                    buckets = s3g.list_buckets().get("Buckets", [])
-                    for b in buckets:
-                        name = b.get("Name")
-                        tags = {}
-                        try:
-                            tagset = s3g.get_bucket_tagging(Bucket=name).get("TagSet", [])
-                            tags = {t["Key"]: t.get("Value", "") for t in tagset}
-                        except ClientError:
-                            pass
-                        account_id = boto3.client("sts").get_caller_identity()["Account"]
-                        if scope == "tag":
-                            if (payload.tag_key and payload.tag_key in tags and
-                               (payload.tag_value is None or tags.get(payload.tag_key) == payload.tag_value)):
-                                matched.append({
-                                    "id": name,
-                                    "resource_type": rtype,
-                                    "region": region,
-                                    "account_id": account_id,
-                                    "tags": tags,
-                                })
-                        else:
-                            matched.append({
-                                "id": name,
-                                "resource_type": rtype,
-                                "region": region,
-                                "account_id": account_id,
-                                "tags": tags,
-                            })
-                elif rtype == "rds:db":
-                    rds = _aws_clients("rds", region)
-                    dbs = rds.describe_db_instances().get("DBInstances", [])
-                    for dbi in dbs:
-                        arn = dbi.get("DBInstanceArn")
-                        tags_list = rds.list_tags_for_resource(ResourceName=arn).get("TagList", [])
-                        tags = {t["Key"]: t.get("Value", "") for t in tags_list}
-                        account_id = boto3.client("sts").get_caller_identity()["Account"]
-                        if scope == "tag":
-                            if (payload.tag_key and payload.tag_key in tags and
-                               (payload.tag_value is None or tags.get(payload.tag_key) == payload.tag_value)):
-                                matched.append({
-                                    "id": dbi.get("DBInstanceIdentifier"),
-                                    "resource_type": rtype,
-                                    "region": region,
-                                    "account_id": account_id,
-                                    "tags": tags,
-                                    "state": dbi.get("DBInstanceStatus"),
-                                })
-                        else:
-                            matched.append({
-                                "id": dbi.get("DBInstanceIdentifier"),
-                                "resource_type": rtype,
-                                "region": region,
-                                "account_id": account_id,
-                                "tags": tags,
-                                "state": dbi.get("DBInstanceStatus"),
-                            })
-                elif rtype == "iam:user":
-                    iam = boto3.client("iam")
-                    users = iam.list_users().get("Users", [])
-                    for u in users:
-                        arn = u.get("Arn")
-                        tags = {}
-                        try:
-                            resp = iam.list_user_tags(UserName=u.get("UserName"))
-                            tags = {t["Key"]: t.get("Value", "") for t in resp.get("Tags", [])}
-                        except ClientError:
-                            pass
-                        account_id = boto3.client("sts").get_caller_identity()["Account"]
-                        if scope == "tag":
-                            if (payload.tag_key and payload.tag_key in tags and
-                               (payload.tag_value is None or tags.get(payload.tag_key) == payload.tag_value)):
-                                matched.append({
-                                    "id": u.get("UserName"),
-                                    "resource_type": rtype,
-                                    "region": region,
-                                    "account_id": account_id,
-                                    "tags": tags,
-                                })
-                        else:
-                            matched.append({
-                                "id": u.get("UserName"),
-                                "resource_type": rtype,
-                                "region": region,
-                                "account_id": account_id,
-                                "tags": tags,
-                            })
-                else:
-                    # Unsupported resource type; skip
-                    continue
+        return s3.get_bucket_tagging(Bucket=name).get("TagSet", [])
+    except ClientError as e:
+        # Buckets without tags raise NoSuchTagSet; anything else is a real failure
+        if e.response.get("Error", {}).get("Code") == "NoSuchTagSet":
+            return []
+        raise
+
+
+def _get_user_tags(iam, name: str) -> List[Dict[str, str]]:
+    try:
+        return iam.list_user_tags(UserName=name).get("Tags", [])
+    except ClientError:
+        return []
+
+
+def _tags_if_match(tag_list: List[Dict[str, str]], key: str, value: Optional[str]) -> Optional[Dict[str, str]]:
+    # Stop at the first matching tag, and only build the dict for accepted resources
+    if not any(t["Key"] == key and (value is None or t.get("Value", "") == value) for t in tag_list):
+        return None
+    return {t["Key"]: t.get("Value", "") for t in tag_list}
+
+
+def _collect_tags(tag_list: List[Dict[str, str]], payload: ListRequest) -> Optional[Dict[str, str]]:
+    # Returns None when a tag-scoped request rejects the resource
+    if payload.filter_scope == "tag":
+        return _tags_if_match(tag_list, payload.tag_key, payload.tag_value)
+    return {t["Key"]: t.get("Value", "") for t in tag_list}
+
+
+def _scan_ec2(region: str, payload: ListRequest, account_id: str) -> List[ResourceRecord]:
+    ec2 = _aws_clients("ec2", region)
+    # Let EC2 do the tag filtering so only candidate instances come back
+    filters = []
+    if payload.filter_scope == "tag":
+        if payload.tag_value is not None:
+            filters.append({"Name": f"tag:{payload.tag_key}", "Values": [payload.tag_value]})
+        else:
+            filters.append({"Name": "tag-key", "Values": [payload.tag_key]})
+
+    matched: List[ResourceRecord] = []
+    paginator = ec2.get_paginator("describe_instances")
+    for resp in paginator.paginate(Filters=filters, PaginationConfig={"PageSize": 1000}):
+        instances = chain.from_iterable(r.get("Instances", ()) for r in resp.get("Reservations", ()))
+        for inst in instances:
+            tags = _collect_tags(inst.get("Tags", ()), payload)
+            if tags is None:
+                continue
+            matched.append(ResourceRecord(
+                id=inst.get("InstanceId"),
+                resource_type=_EC2_INSTANCE,
+                region=region,
+                account_id=account_id,
+                tags=tags,
+                state=inst.get("State", {}).get("Name"),
+            ))
+    return matched
+
+
+def _scan_s3(region: str, payload: ListRequest, account_id: str) -> List[ResourceRecord]:
+    # S3 is global, but we try to fetch list then get tags per bucket
+    s3g = _aws_clients("s3", _GLOBAL_REGION)
+    names = _cached(
+        (account_id, "list_buckets"),
+        lambda: [b.get("Name") for b in s3g.list_buckets().get("Buckets", [])],
+    )
+
+    def bucket_tags(name: str) -> List[Dict[str, str]]:
+        try:
+            return _cached((account_id, name, "tags"), partial(_get_bucket_tags, s3g, name))
+        except ClientError:
+            # Throttling or access errors: show the bucket untagged for this
+            # request only; _cached does not store failed fetches
+            return []
+
+    with ThreadPoolExecutor(max_workers=_TAG_FETCH_WORKERS) as executor:
+        tag_lists = list(executor.map(bucket_tags, names))
+
+    matched: List[ResourceRecord] = []
+    for name, tag_list in zip(names, tag_lists):
+        tags = _collect_tags(tag_list, payload)
+        if tags is None:
+            continue
+        matched.append(ResourceRecord(
+            id=name,
+            resource_type=_S3_BUCKET,
+            region=region,
+            account_id=account_id,
+            tags=tags,
+        ))
+    return matched
+
+
+def _scan_rds(region: str, payload: ListRequest, account_id: str) -> List[ResourceRecord]:
+    rds = _aws_clients("rds", region)
+    matched: List[ResourceRecord] = []
+    # DescribeDBInstances returns each instance's TagList inline, so no
+    # per-instance ListTagsForResource round-trip is needed
+    dbs = chain.from_iterable(
+        page.get("DBInstances", ()) for page in rds.get_paginator("describe_db_instances").paginate()
+    )
+    for dbi in dbs:
+        tags = _collect_tags(dbi.get("TagList", ()), payload)
+        if tags is None:
+            continue
+        matched.append(ResourceRecord(
+            id=dbi.get("DBInstanceIdentifier"),
+            resource_type=_RDS_DB,
+            region=region,
+            account_id=account_id,
+            tags=tags,
+            state=dbi.get("DBInstanceStatus"),
+        ))
+    return matched
+
+
+def _scan_iam(region: str, payload: ListRequest, account_id: str) -> List[ResourceRecord]:
+    iam = _aws_clients("iam", _GLOBAL_REGION)
+    names = _cached(
+        (account_id, "list_users"),
+        lambda: [u.get("UserName") for u in iam.list_users().get("Users", [])],
+    )
+    with ThreadPoolExecutor(max_workers=_TAG_FETCH_WORKERS) as executor:
+        tag_lists = list(executor.map(partial(_get_user_tags, iam), names))
+
+    matched: List[ResourceRecord] = []
+    for name, tag_list in zip(names, tag_lists):
+        tags = _collect_tags(tag_list, payload)
+        if tags is None:
+            continue
+        matched.append(ResourceRecord(
+            id=name,
+            resource_type=_IAM_USER,
+            region=region,
+            account_id=account_id,
+            tags=tags,
+        ))
+    return matched
+
+
+_SCANNERS = {
+    _EC2_INSTANCE: _scan_ec2,
+    _S3_BUCKET: _scan_s3,
+    _RDS_DB: _scan_rds,
+    _IAM_USER: _scan_iam,
+}
+
+
+def _parse_arn(arn: str):
+    # arn:partition:service:region:account:resource
+    _, _, service, region, account, resource = arn.split(":", 5)
+    return service, region, account, resource
+
+
+def _classify_tagged_arn(service: str, region: str, account: str, resource: str):
+    """
+    Map a tagging API ARN to (resource_type, id), or None for anything that is
+    not exactly a supported resource, so nothing else can become a deletable
+    record.
+    """
+    if service == "ec2" and resource.startswith("instance/"):
+        rid = resource[len("instance/"):]
+        return (_EC2_INSTANCE, rid) if rid and "/" not in rid else None
+    if service == "rds" and resource.startswith("db:"):
+        rid = resource[len("db:"):]
+        return (_RDS_DB, rid) if rid and ":" not in rid else None
+    return None
+
+
+def _ec2_states(region: str, ids: List[str]) -> Dict[str, Optional[str]]:
+    ec2 = _aws_clients("ec2", region)
+    states: Dict[str, Optional[str]] = {}
+    for i in range(0, len(ids), _DESCRIBE_BATCH_SIZE):
+        chunk = ids[i:i + _DESCRIBE_BATCH_SIZE]
+        try:
+            pages = [ec2.describe_instances(InstanceIds=chunk)]
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != "InvalidInstanceID.NotFound":
+                raise
+            # Instances gone past their terminated window fail the id lookup as a
+            # whole; an instance-id filter just omits them instead. Filters take
+            # fewer values per call than InstanceIds, so re-chunk.
+            paginator = ec2.get_paginator("describe_instances")
+            pages = chain.from_iterable(
+                paginator.paginate(Filters=[{"Name": "instance-id", "Values": chunk[j:j + _FILTER_VALUES_LIMIT]}])
+                for j in range(0, len(chunk), _FILTER_VALUES_LIMIT)
+            )
+        for resp in pages:
+            for inst in chain.from_iterable(r.get("Instances", ()) for r in resp.get("Reservations", ())):
+                states[inst.get("InstanceId")] = inst.get("State", {}).get("Name")
+    return states
+
+
+def _rds_states(region: str) -> Dict[str, Optional[str]]:
+    rds = _aws_clients("rds", region)
+    return {
+        dbi.get("DBInstanceIdentifier"): dbi.get("DBInstanceStatus")
+        for page in rds.get_paginator("describe_db_instances").paginate()
+        for dbi in page.get("DBInstances", ())
+    }
+
+
+def _scan_tagged(region: str, resource_types: List[str], payload: ListRequest, account_id: str) -> List[ResourceRecord]:
+    # One paginated Resource Groups Tagging API query replaces the per-service
+    # describe + per-resource tag lookups for every supported type in the region
+    tagging = _aws_clients("resourcegroupstaggingapi", region)
+    tag_filter = {"Key": payload.tag_key, "Values": [payload.tag_value] if payload.tag_value is not None else []}
+    type_filters = [_TAGGING_API_TYPES[rt] for rt in resource_types]
+    found = []
+
+    paginator = tagging.get_paginator("get_resources")
+    for resp in paginator.paginate(TagFilters=[tag_filter], ResourceTypeFilters=type_filters):
+        for mapping in resp.get("ResourceTagMappingList", []):
+            arn = mapping["ResourceARN"]
+            service, arn_region, arn_account, resource = _parse_arn(arn)
+            classified = _classify_tagged_arn(service, arn_region, arn_account, resource)
+            if classified is None or classified[0] not in resource_types:
+                continue
+            rtype, rid = classified
+            found.append((rtype, rid, arn_region, arn_account, mapping.get("Tags", [])))
+
+    # The tagging API carries no state; fill it in with batched describes so
+    # callers can tell running, stopped and terminated resources apart
+    ec2_ids = [rid for rtype, rid, *_ in found if rtype == _EC2_INSTANCE]
+    ec2_states = _ec2_states(region, ec2_ids) if ec2_ids else {}
+    has_rds = any(rtype == _RDS_DB for rtype, *_ in found)
+    rds_states = _rds_states(region) if has_rds else {}
+    states = {_EC2_INSTANCE: ec2_states, _RDS_DB: rds_states}
+
+    return [
+        ResourceRecord(
+            id=rid,
+            resource_type=rtype,
+            region=arn_region,
+            account_id=arn_account or account_id,
+            tags={t["Key"]: t.get("Value", "") for t in tags},
+            state=states.get(rtype, {}).get(rid),
+        )
+        for rtype, rid, arn_region, arn_account, tags in found
+    ]
+
+
+async def _scan_tagged_regions(regions: Sequence[str], resource_types: List[str], payload: ListRequest,
+                               account_id: str) -> List[ResourceRecord]:
+    results = await asyncio.gather(
+        *(asyncio.to_thread(_scan_tagged, region, resource_types, payload, account_id) for region in regions)
+    )
+    return [record for result in results for record in result]
+
+
+async def _plan_scan(payload: ListRequest, account_id: str):
+    """
+    Resolve everything the tagging API can answer up front and return those
+    records along with the (region, resource_type) pairs left for _SCANNERS.
+    """
+    regions = payload.regions or _DEFAULT_REGIONS
+    resource_types = [sys.intern(rt) for rt in payload.resource_types or _DEFAULT_RESOURCE_TYPES]
+
+    matched: List[ResourceRecord] = []
+    if payload.filter_scope == "tag" and payload.tag_key:
+        tagged_types = [rt for rt in resource_types if rt in _TAGGING_API_TYPES]
+        if tagged_types:
+            try:
+                matched = await _scan_tagged_regions(regions, tagged_types, payload, account_id)
+                resource_types = [rt for rt in resource_types if rt not in _TAGGING_API_TYPES]
+            except ClientError as e:
+                # Without tag:GetResources permission, fall back to scanning each service
+                if e.response.get("Error", {}).get("Code") not in _ACCESS_DENIED_CODES:
+                    raise
+
+    if payload.filter_scope == "tag" and not payload.tag_key:
+        # A tag scope without a key can never match; skip the AWS calls
+        return matched, []
+
+    # Global services are scanned exactly once, ahead of the regional fan-out
+    resource_types = [rt for rt in resource_types if rt in _SCANNERS]
+    tasks = [(_GLOBAL_REGION_LABEL, rtype) for rtype in resource_types if rtype in _GLOBAL_TYPES]
+    tasks += [(region, rtype) for region in regions for rtype in resource_types
+              if rtype not in _GLOBAL_TYPES]
+    return matched, tasks
+
+
+@app.post("/list", response_model=ListResponse)
+async def list_resources(payload: ListRequest) -> ListResponse:
+    try:
+        # boto3 is blocking; run every call off the event loop
+        account_id = await asyncio.to_thread(_get_account_id)
+        matched, tasks = await _plan_scan(payload, account_id)
+        results = await asyncio.gather(
+            *(asyncio.to_thread(_SCANNERS[rtype], region, payload, account_id) for region, rtype in tasks)
+        )
+        for result in results:
+            matched.extend(result)
+    except ClientError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return ListResponse(count=len(matched), resources=matched)
+
+
+@app.post("/list/stream")
+async def list_resources_stream(payload: ListRequest):
+    """
+    Same matching as /list, streamed as NDJSON: one resource per line as each
+    scan finishes, followed by a {"count": n} summary line.
+    """
+    try:
+        account_id = await asyncio.to_thread(_get_account_id)
+        found, tasks = await _plan_scan(payload, account_id)
     except ClientError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-    return {"count": len(matched), "resources": matched}
+    async def _generate():
+        count = 0
+        scans = [
+            asyncio.create_task(asyncio.to_thread(_SCANNERS[rtype], region, payload, account_id))
+            for region, rtype in tasks
+        ]
+        try:
+            for record in found:
+                count += 1
+                yield orjson.dumps(record) + b"\n"
+            for scan in asyncio.as_completed(scans):
+                for record in await scan:
+                    count += 1
+                    yield orjson.dumps(record) + b"\n"
+        except Exception as e:
+            # Headers are already sent, so report the failure in-band
+            yield orjson.dumps({"error": str(e)}) + b"\n"
+            return
+        finally:
+            # On a failed scan or a client disconnect, don't leave the other
+            # scans running with exceptions nobody retrieves
+            for scan in scans:
+                scan.cancel()
+            await asyncio.gather(*scans, return_exceptions=True)
+        yield orjson.dumps({"count": count}) + b"\n"
+
+    return StreamingResponse(_generate(), media_type="application/x-ndjson")
+
+
+async def _terminate_chunk(ec2, ids: List[str]) -> List[Dict[str, Any]]:
+    try:
+        resp = await asyncio.to_thread(ec2.terminate_instances, InstanceIds=ids)
+    except ClientError as e:
+        code = e.response.get("Error", {}).get("Code", "")
+        if len(ids) > 1 and code.startswith("InvalidInstanceID."):
+            # One bad id fails the whole call; bisect so the rest still go in
+            # O(k log n) calls for k bad ids rather than one call per id
+            mid = len(ids) // 2
+            halves = await asyncio.gather(_terminate_chunk(ec2, ids[:mid]), _terminate_chunk(ec2, ids[mid:]))
+            return [outcome for half in halves for outcome in half]
+        # Throttling, permissions etc. apply to every id alike; don't fan out
+        return [{"id": rid, "error": str(e)} for rid in ids]
+    except Exception as e:
+        return [{"id": rid, "error": str(e)} for rid in ids]
+    terminating = {t.get("InstanceId") for t in resp.get("TerminatingInstances", [])}
+    return [
+        {"id": rid, "status": "terminated"} if rid in terminating
+        else {"id": rid, "error": "instance not reported as terminating"}
+        for rid in ids
+    ]
+
+
+async def _delete_ec2_batch(region: str, ids: List[str]) -> List[Dict[str, Any]]:
+    try:
+        ec2 = await asyncio.to_thread(_aws_clients, "ec2", region)
+    except Exception as e:
+        # e.g. a malformed region; fail these ids, not the request
+        return [{"id": rid, "error": str(e)} for rid in ids]
+    # TerminateInstances accepts many ids per call, so batch instead of one call each
+    chunks = [ids[i:i + _TERMINATE_BATCH_SIZE] for i in range(0, len(ids), _TERMINATE_BATCH_SIZE)]
+    results = await asyncio.gather(*(_terminate_chunk(ec2, chunk) for chunk in chunks))
+    return [outcome for result in results for outcome in result]
+
+
+def _delete_object_batch(s3, rid: str, objects: List[Dict[str, str]]) -> None:
+    resp = s3.delete_objects(Bucket=rid, Delete={"Objects": objects, "Quiet": True})
+    # Quiet mode reports per-key failures in the body instead of raising
+    errors = resp.get("Errors")
+    if errors:
+        first = errors[0]
+        raise ClientError(
+            {"Error": {"Code": first.get("Code"), "Message": f"{first.get('Key')}: {first.get('Message')}"}},
+            "DeleteObjects",
+        )
+
+
+def _empty_and_delete_bucket(rid: str) -> None:
+    s3 = _aws_clients("s3", _GLOBAL_REGION)
+    # Must empty bucket before delete. Listing versions covers plain objects too
+    # (their VersionId is "null"), and each page fits one DeleteObjects call, so
+    # pages are deleted in parallel while the listing continues.
+    paginator = s3.get_paginator("list_object_versions")
+    with ThreadPoolExecutor(max_workers=_S3_DELETE_WORKERS) as executor:
+        pending = set()
+        for page in paginator.paginate(Bucket=rid, PaginationConfig={"PageSize": _S3_DELETE_BATCH_SIZE}):
+            objects = [
+                {"Key": v["Key"], "VersionId": v["VersionId"]}
+                for v in chain(page.get("Versions", ()), page.get("DeleteMarkers", ()))
+            ]
+            if not objects:
+                continue
+            # Bound the queued pages so huge buckets don't pile up key lists in memory
+            if len(pending) >= 2 * _S3_DELETE_WORKERS:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+            pending.add(executor.submit(_delete_object_batch, s3, rid, objects))
+        for future in pending:
+            future.result()
+    s3.delete_bucket(Bucket=rid)
+    account_id = _get_account_id()
+    _invalidate((account_id, "list_buckets"), (account_id, rid, "tags"))
+
+
+async def _delete_s3(rid: str, region: str) -> str:
+    await asyncio.to_thread(_empty_and_delete_bucket, rid)
+    return "deleted"
+
+
+async def _delete_rds(rid: str, region: str) -> str:
+    rds = await asyncio.to_thread(_aws_clients, "rds", region)
+    await asyncio.to_thread(
+        rds.delete_db_instance, DBInstanceIdentifier=rid, SkipFinalSnapshot=True, DeleteAutomatedBackups=True
+    )
+    return "deletion-started"
+
+
+async def _delete_iam(rid: str, region: str) -> str:
+    iam = await asyncio.to_thread(_aws_clients, "iam", _GLOBAL_REGION)
+    # Detach policies and delete access keys before user deletion. The three
+    # listings are independent, and so is every cleanup call they produce.
+    keys, policies, groups = await asyncio.gather(
+        asyncio.to_thread(iam.list_access_keys, UserName=rid),
+        asyncio.to_thread(iam.list_attached_user_policies, UserName=rid),
+        asyncio.to_thread(iam.list_groups_for_user, UserName=rid),
+    )
+    await asyncio.gather(
+        *(asyncio.to_thread(iam.delete_access_key, UserName=rid, AccessKeyId=k.get("AccessKeyId"))
+          for k in keys.get("AccessKeyMetadata", [])),
+        *(asyncio.to_thread(iam.detach_user_policy, UserName=rid, PolicyArn=p.get("PolicyArn"))
+          for p in policies.get("AttachedPolicies", [])),
+        *(asyncio.to_thread(iam.remove_user_from_group, UserName=rid, GroupName=g.get("GroupName"))
+          for g in groups.get("Groups", [])),
+    )
+    await asyncio.to_thread(iam.delete_user, UserName=rid)
+    account_id = await asyncio.to_thread(_get_account_id)
+    _invalidate((account_id, "list_users"))
+    return "deleted"
+
+
+_DELETERS = {
+    _S3_BUCKET: _delete_s3,
+    _RDS_DB: _delete_rds,
+    _IAM_USER: _delete_iam,
+}
+
+
+async def _delete_one(r: Dict[str, Any]) -> Dict[str, Any]:
+    rid = r.get("id")
+    deleter = _DELETERS.get(r.get("resource_type"))
+    if deleter is None:
+        return {"id": rid, "error": "unsupported resource type"}
+    try:
+        return {"id": rid, "status": await deleter(rid, r.get("region"))}
+    except Exception as e:
+        # Report per resource so one bad entry never hides what else was deleted
+        return {"id": rid, "error": str(e)}
 
 
 @app.post("/delete")
@@ -212,51 +677,31 @@ async def delete_resources(payload: DeleteRequest):
     results = []
     errors = []
     try:
+        # EC2 instances are terminated in per-region batches; everything else is
+        # deleted independently, and all of it runs concurrently
+        ec2_ids: Dict[str, List[str]] = {}
+        others = []
         for r in payload.resources:
-            rtype = r.get("resource_type")
-            region = r.get("region")
-            rid = r.get("id")
-            if rtype == "ec2:instance":
-                ec2 = _aws_clients("ec2", region)
-                try:
-                    ec2.terminate_instances(InstanceIds=[rid])
-                    results.append({"id": rid, "status": "terminated"})
-                except ClientError as e:
-                    errors.append({"id": rid, "error": str(e)})
-            elif rtype == "s3:bucket":
-                s3 = boto3.resource("s3")
-                bucket = s3.Bucket(rid)
-                try:
-                    # Must empty bucket before delete
-                    bucket.objects.all().delete()
-                    bucket.object_versions.delete()
-                    bucket.delete()
-                    results.append({"id": rid, "status": "deleted"})
-                except ClientError as e:
-                    errors.append({"id": rid, "error": str(e)})
-            elif rtype == "rds:db":
-                rds = _aws_clients("rds", region)
-                try:
-                    rds.delete_db_instance(DBInstanceIdentifier=rid, SkipFinalSnapshot=True, DeleteAutomatedBackups=True)
-                    results.append({"id": rid, "status": "deletion-started"})
-                except ClientError as e:
-                    errors.append({"id": rid, "error": str(e)})
-            elif rtype == "iam:user":
-                iam = boto3.client("iam")
-                try:
-                    # Detach policies and delete access keys before user deletion
-                    for k in iam.list_access_keys(UserName=rid).get("AccessKeyMetadata", []):
-                        iam.delete_access_key(UserName=rid, AccessKeyId=k.get("AccessKeyId"))
-                    for p in iam.list_attached_user_policies(UserName=rid).get("AttachedPolicies", []):
-                        iam.detach_user_policy(UserName=rid, PolicyArn=p.get("PolicyArn"))
-                    for g in iam.list_groups_for_user(UserName=rid).get("Groups", []):
-                        iam.remove_user_from_group(UserName=rid, GroupName=g.get("GroupName"))
-                    iam.delete_user(UserName=rid)
-                    results.append({"id": rid, "status": "deleted"})
-                except ClientError as e:
-                    errors.append({"id": rid, "error": str(e)})
+            if r.get("resource_type") == _EC2_INSTANCE:
+                rid = r.get("id")
+                if not isinstance(rid, str) or not rid:
+                    # A single malformed id would fail the whole batch it lands in
+                    errors.append({"id": rid, "error": "missing or invalid instance id"})
+                    continue
+                ec2_ids.setdefault(r.get("region"), []).append(rid)
+            else:
+                others.append(r)
+
+        ec2_outcomes, other_outcomes = await asyncio.gather(
+            asyncio.gather(*(_delete_ec2_batch(region, ids) for region, ids in ec2_ids.items())),
+            asyncio.gather(*(_delete_one(r) for r in others)),
+        )
+        outcomes = chain(chain.from_iterable(ec2_outcomes), other_outcomes)
+        for outcome in outcomes:
+            if "error" in outcome:
+                errors.append(outcome)
             else:
-                errors.append({"id": rid, "error": "unsupported resource type"})
+                results.append(outcome)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 